@@ -7,9 +7,9 @@ Button class for forms in Pygame
 '''
 
 import pygame
-import os.path
 
 from .Constants import point, color
+from .Style import get_font_key, get_font
 
 pygame.font.init()
 
@@ -18,6 +18,11 @@ class Button(object):
     Button class for forms in Pygame.
     '''
     
+    __slots__ = ('position', 'character_count', 'font', 'font_size',
+                 'antialias', 'value', 'value_object', 'text_color',
+                 'box_color', 'text_width', 'text_height', 'box_dimension',
+                 'box', 'text_position')
+
     def __init__(self,
                  position = point(x = 0, y = 0),
                  value = 'Acccept',
@@ -47,9 +52,7 @@ class Button(object):
 
         # Text variables
         self.character_count = character_count
-        if not os.path.isfile(font_family):
-            font_family = pygame.font.match_font(font_family)
-        self.font = pygame.font.Font(font_family, font_size)
+        self.font = get_font(get_font_key(font_family, font_size))
         self.font_size = font_size
         self.antialias = antialias
         self.value = value
@@ -0,0 +1,320 @@
+'''
+David Fuller
+
+Form class for forms in Pygame
+
+2018-2-10
+'''
+
+import pygame
+import os
+import json
+import pickle
+import hashlib
+import tempfile
+from collections import namedtuple
+
+from .Constants import point, color
+from .Label import Label
+from .Button import Button
+from .Textbox import Textbox, InputBox
+from .Table import Table
+from .Style import style, get_font, get_style, find_font_key, \
+                   get_font_paths, add_font_paths
+
+pygame.font.init()
+
+element_types = {'Label': Label,
+                 'Button': Button,
+                 'Textbox': Textbox,
+                 'InputBox': InputBox,
+                 'Table': Table}
+
+# Stand-ins for objects that can not be pickled
+widget_data = namedtuple('widget_data', ['type', 'attributes'])
+surface_data = namedtuple('surface_data', ['size', 'pixels'])
+font_data = namedtuple('font_data', ['key'])
+
+# Changes whenever the cache file layout changes
+snapshot_version = 1
+
+_to_bytes = getattr(pygame.image, 'tobytes', None) or pygame.image.tostring
+_from_bytes = getattr(pygame.image, 'frombytes', None) or pygame.image.fromstring
+
+def _slots(element_type):
+    '''
+    Returns all slot names of a form element class, including inherited ones.
+    '''
+
+    names = []
+    for klass in element_type.__mro__:
+        names.extend(getattr(klass, '__slots__', ()))
+    return names
+
+def _file_signature(path):
+    '''
+    Returns size and modification time of a file, None if it is missing.
+    '''
+
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_size, stat.st_mtime)
+
+def _font_keys(value):
+    '''
+    Returns the keys of all fonts used in data made by _dump.
+    '''
+
+    if isinstance(value, font_data):
+        return set([value.key])
+    if isinstance(value, style):
+        return set([value.font])
+    if isinstance(value, widget_data):
+        value = list(value.attributes.values())
+    if isinstance(value, list):
+        keys = set()
+        for item in value:
+            keys.update(_font_keys(item))
+        return keys
+    return set()
+
+def _dump(value):
+    '''
+    Converts a form element, or one of its attributes, to picklable data.
+    Callbacks are not kept.
+    '''
+
+    if isinstance(value, pygame.Surface):
+        return surface_data(size = value.get_size(),
+                            pixels = _to_bytes(value, 'RGBA'))
+    if isinstance(value, pygame.font.Font):
+        return font_data(key = find_font_key(value))
+    if isinstance(value, tuple(element_types.values())):
+        attributes = {}
+        for slot in _slots(type(value)):
+            if hasattr(value, slot) and not callable(getattr(value, slot)):
+                attributes[slot] = _dump(getattr(value, slot))
+        return widget_data(type = type(value).__name__, attributes = attributes)
+    if isinstance(value, list):
+        return [_dump(item) for item in value]
+    return value
+
+def _load(value):
+    '''
+    Converts data made by _dump back to a form element or attribute.
+    '''
+
+    if isinstance(value, surface_data):
+        if not all(value.size):
+            return pygame.Surface(value.size, pygame.SRCALPHA)
+        return _from_bytes(value.pixels, value.size, 'RGBA')
+    if isinstance(value, font_data):
+        return get_font(value.key)
+    if isinstance(value, style):
+        return get_style(**value._asdict())
+    if isinstance(value, widget_data):
+        element_type = element_types[value.type]
+        element = element_type.__new__(element_type)
+        for slot in _slots(element_type):
+            setattr(element, slot, _load(value.attributes.get(slot)))
+        return element
+    if isinstance(value, list):
+        return [_load(item) for item in value]
+    return value
+
+class Form(object):
+    '''
+    Form class for forms in Pygame. Builds form elements from a spec, a dict
+    or JSON string with a list of elements, each taking the arguments of its
+    class:
+
+        {'elements': [{'type': 'Label', 'name': 'title',
+                       'value': 'Login', 'position': [10, 10]},
+                      {'type': 'InputBox', 'name': 'user',
+                       'position': [10, 40], 'character_count': 20}]}
+
+    Elements can be retrieved with get(name). With cache_dir set, the built
+    elements, including their geometry and rendered text, are saved to a
+    cache file keyed by spec, element classes and pygame version, so later
+    starts load them instead of resolving fonts, measuring and rendering
+    again. Cache files are loaded with pickle and must only come from a
+    trusted directory.
+    '''
+
+    __slots__ = ('spec', 'cache_dir', 'elements', 'names')
+
+    def __init__(self,
+                 spec,
+                 cache_dir = None):
+        '''
+        init for Form class.
+
+        Args:
+            spec (dict): form spec, or the same as a JSON string
+            cache_dir (str): directory for compiled form cache files, None
+                             to always compile
+        '''
+
+        if isinstance(spec, str):
+            spec = json.loads(spec)
+        self.spec = spec
+        self.cache_dir = cache_dir
+        self.elements = []
+        self.names = {}
+
+        # Create Form objects
+        self.create()
+
+    def create(self):
+        '''
+        Loads form elements from the cache file, or compiles them and saves
+        the cache file.
+        '''
+
+        path = self.cache_path()
+        if path is not None and self.load(path):
+            return
+
+        self.compile()
+        if path is not None:
+            self.save(path)
+
+    def compile(self):
+        '''
+        Builds form elements from spec.
+        '''
+
+        self.elements = []
+        self.names = {}
+
+        for element_spec in self.spec['elements']:
+            arguments = dict(element_spec)
+            element_type = element_types[arguments.pop('type')]
+            name = arguments.pop('name', None)
+            for argument, value in arguments.items():
+                if argument == 'position':
+                    arguments[argument] = point(*value)
+                elif argument.endswith('_color'):
+                    arguments[argument] = color(*value)
+            element = element_type(**arguments)
+
+            # Render text of the rows shown first
+            if isinstance(element, Table):
+                for row in element.visible_rows():
+                    for cell in element.row_cells(row):
+                        cell.render()
+            elif isinstance(element, Textbox):
+                element.render()
+
+            self.elements.append(element)
+            if name is not None:
+                self.names[name] = element
+
+    def cache_path(self):
+        '''
+        Path of the cache file for this spec, the slots of the form element
+        classes and pygame version.
+
+        Returns:
+            str: cache file path, None without a cache_dir
+        '''
+
+        if self.cache_dir is None:
+            return None
+
+        ttf_version = getattr(pygame.font, 'get_sdl_ttf_version', lambda: None)()
+        element_slots = [(name, _slots(element_type))
+                         for name, element_type in sorted(element_types.items())]
+        key = json.dumps([snapshot_version, element_slots, pygame.version.ver,
+                          ttf_version, self.spec], sort_keys = True)
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, 'form-' + digest + '.pickle')
+
+    def save(self, path):
+        '''
+        Saves form elements to a cache file.
+
+        Args:
+            path (str): cache file path
+        '''
+
+        elements = _dump(self.elements)
+
+        # Only the fonts of this form decide whether the cache is still valid
+        used_paths = set(key.path for key in _font_keys(elements))
+        font_paths = dict((font_family, font_path)
+                          for font_family, font_path in get_font_paths().items()
+                          if font_path in used_paths)
+        snapshot = {'font_paths': font_paths,
+                    'font_files': dict((font_path, _file_signature(font_path))
+                                       for font_path in used_paths
+                                       if font_path is not None),
+                    'elements': elements,
+                    'names': dict((name, self.elements.index(element))
+                                  for name, element in self.names.items())}
+
+        directory = os.path.dirname(path) or '.'
+        os.makedirs(directory, exist_ok = True)
+
+        # Write to a temporary file of this process first, so a half written
+        # cache is never read, even when several processes save at once
+        handle, temporary_path = tempfile.mkstemp(dir = directory,
+                                                  suffix = '.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as cache_file:
+                pickle.dump(snapshot, cache_file, pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_path, path)
+        except:
+            os.remove(temporary_path)
+            raise
+
+    def load(self, path):
+        '''
+        Loads form elements from a cache file.
+
+        Args:
+            path (str): cache file path
+
+        Returns:
+            True: form elements loaded
+            False: cache file is missing, unreadable or its fonts changed
+        '''
+
+        try:
+            with open(path, 'rb') as cache_file:
+                snapshot = pickle.load(cache_file)
+        except Exception:
+            return False
+
+        for font_path, signature in snapshot['font_files'].items():
+            if _file_signature(font_path) != signature:
+                return False
+
+        add_font_paths(snapshot['font_paths'])
+        self.elements = _load(snapshot['elements'])
+        self.names = dict((name, self.elements[index])
+                          for name, index in snapshot['names'].items())
+        return True
+
+    def get(self, name):
+        '''
+        Returns the form element with the given name.
+
+        Args:
+            name (str): name of element in spec
+        '''
+
+        return self.names[name]
+
+    def show(self, surface):
+        '''
+        Shows all form elements on a given surface.
+
+        Args:
+            surface (pygame.surface): Surface to show form on.
+        '''
+
+        for element in self.elements:
+            element.show(surface)
@@ -7,9 +7,9 @@ Label class for forms in Pygame
 '''
 
 import pygame
-import os.path
 
 from .Constants import point, color
+from .Style import get_font_key, get_font
 
 pygame.font.init()
 
@@ -19,6 +19,9 @@ class Label(object):
     class.value.
     '''
 
+    __slots__ = ('position', 'font', 'font_size', 'antialias', 'value',
+                 'text_color', 'value_object')
+
     def __init__(self,
                  value = '',
                  position = point(x = 0, y = 0),
@@ -43,9 +46,7 @@ class Label(object):
         self.position = position
 
         # Text variables
-        if not os.path.isfile(font_family):
-            font_family = pygame.font.match_font(font_family)
-        self.font = pygame.font.Font(font_family, font_size)
+        self.font = get_font(get_font_key(font_family, font_size))
         self.font_size = font_size
         self.antialias = antialias
         self.value = value
@@ -0,0 +1,198 @@
+'''
+David Fuller
+
+Render file - Offscreen rendering of form elements and golden image tests.
+
+Form elements are drawn to plain surfaces, so no display is needed. Layouts
+given as Form specs can be checked against stored golden images in a pool
+of processes, one layout per task.
+
+2018-2-17
+'''
+
+import pygame
+import os.path
+import multiprocessing
+from collections import namedtuple
+
+from .Constants import color, resolution
+from .Form import Form
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+pygame.font.init()
+
+render_result = namedtuple('render_result', ['name', 'passed', 'missing',
+                                             'different_pixels', 'golden_path'])
+
+def _require_numpy():
+    '''
+    Raises ImportError if numpy, needed for pygame.surfarray, is missing.
+    '''
+
+    if numpy is None:
+        raise ImportError('numpy is required for surface arrays')
+
+def render(elements,
+           size = resolution(width = 640, height = 480),
+           background_color = color(r = 255, g = 255, b = 255)):
+    '''
+    Draws form elements on a new surface, without a display.
+
+    Args:
+        elements (list): form elements (Label, Button, Textbox, InputBox,
+                         Table or Form), or a single element
+        size (namedtuple('resolution', ['width', 'height'])): surface size
+        background_color (namedtuple('color', ['r', 'g', 'b'])): color the
+                                                                 surface is
+                                                                 filled with
+
+    Returns:
+        pygame.Surface
+    '''
+
+    surface = pygame.Surface(size)
+    surface.fill(background_color)
+
+    if not isinstance(elements, (list, tuple)):
+        elements = [elements]
+    for element in elements:
+        element.show(surface)
+
+    return surface
+
+def render_array(elements,
+                 size = resolution(width = 640, height = 480),
+                 background_color = color(r = 255, g = 255, b = 255)):
+    '''
+    Draws form elements like render() and returns the pixels as a NumPy
+    array of shape (width, height, 3).
+    '''
+
+    _require_numpy()
+    return pygame.surfarray.array3d(render(elements, size, background_color))
+
+def different_pixels(array, golden, tolerance = 0):
+    '''
+    Counts pixels where any color channel differs by more than tolerance.
+
+    Args:
+        array (numpy.ndarray): pixels of shape (width, height, 3)
+        golden (numpy.ndarray): expected pixels of the same shape
+        tolerance (int): largest allowed difference per channel
+
+    Returns:
+        int: number of different pixels, all pixels if shapes differ
+    '''
+
+    _require_numpy()
+    if array.shape != golden.shape:
+        return max(array.shape[0] * array.shape[1],
+                   golden.shape[0] * golden.shape[1])
+
+    difference = numpy.abs(array.astype(numpy.int16) - golden.astype(numpy.int16))
+    return int(numpy.count_nonzero(difference.max(axis = 2) > tolerance))
+
+def check_golden(name,
+                 spec,
+                 golden_dir,
+                 size = resolution(width = 640, height = 480),
+                 background_color = color(r = 255, g = 255, b = 255),
+                 tolerance = 0,
+                 max_different_pixels = 0,
+                 update = False):
+    '''
+    Renders a Form spec and compares it to its golden image, golden_dir/
+    name.png. A missing golden image fails, unless update is set.
+
+    Args:
+        name (str): layout name
+        spec (dict): Form spec of layout
+        golden_dir (str): directory of golden images
+        size (namedtuple('resolution', ['width', 'height'])): surface size
+        background_color (namedtuple('color', ['r', 'g', 'b'])): color the
+                                                                 surface is
+                                                                 filled with
+        tolerance (int): largest allowed difference per channel
+        max_different_pixels (int): number of different pixels allowed
+        update (bool): whether to create or overwrite the golden image
+
+    Returns:
+        namedtuple('render_result', [...]), missing is True when there is
+        no golden image to compare to
+    '''
+
+    surface = render(Form(spec), size, background_color)
+    golden_path = os.path.join(golden_dir, name + '.png')
+
+    if update:
+        pygame.image.save(surface, golden_path)
+        return render_result(name = name, passed = True, missing = False,
+                             different_pixels = 0, golden_path = golden_path)
+
+    if not os.path.isfile(golden_path):
+        return render_result(name = name, passed = False, missing = True,
+                             different_pixels = None, golden_path = golden_path)
+
+    _require_numpy()
+    golden = pygame.surfarray.array3d(pygame.image.load(golden_path))
+    different = different_pixels(pygame.surfarray.array3d(surface), golden,
+                                 tolerance)
+    return render_result(name = name,
+                         passed = different <= max_different_pixels,
+                         missing = False,
+                         different_pixels = different,
+                         golden_path = golden_path)
+
+def _check_golden_job(job):
+    '''
+    Runs check_golden in a pool process.
+    '''
+
+    return check_golden(*job)
+
+def run_golden_tests(layouts,
+                     golden_dir,
+                     size = resolution(width = 640, height = 480),
+                     background_color = color(r = 255, g = 255, b = 255),
+                     tolerance = 0,
+                     max_different_pixels = 0,
+                     update = False,
+                     processes = None):
+    '''
+    Checks many layouts against their golden images, spread over a pool of
+    processes. Layouts are passed as Form specs since form elements can not
+    be sent between processes.
+
+    Args:
+        layouts (dict): Form spec of each layout, keyed by layout name
+        golden_dir (str): directory of golden images
+        size (namedtuple('resolution', ['width', 'height'])): surface size
+        background_color (namedtuple('color', ['r', 'g', 'b'])): color the
+                                                                 surface is
+                                                                 filled with
+        tolerance (int): largest allowed difference per channel
+        max_different_pixels (int): number of different pixels allowed
+        update (bool): whether to create or overwrite the golden images
+        processes (int): number of processes, None for one per core, 1 to
+                         run in this process
+
+    Returns:
+        list: namedtuple('render_result', [...]) of each layout, by name
+    '''
+
+    if update and not os.path.isdir(golden_dir):
+        os.makedirs(golden_dir)
+
+    jobs = [(name, layouts[name], golden_dir, size, background_color,
+             tolerance, max_different_pixels, update)
+            for name in sorted(layouts)]
+
+    if processes == 1:
+        return [_check_golden_job(job) for job in jobs]
+
+    with multiprocessing.Pool(processes) as pool:
+        return pool.map(_check_golden_job, jobs)
@@ -0,0 +1,261 @@
+'''
+David Fuller
+
+Style file - Shared, immutable style and font objects for form elements.
+
+Widgets that are created in bulk (e.g. Table cells) reference these objects
+instead of holding their own copies of colors, fonts and alignment, so two
+cells that look the same share a single style and a single pygame font.
+
+2018-2-3
+'''
+
+import pygame
+import heapq
+import os.path
+from collections import namedtuple
+
+pygame.font.init()
+
+font_key = namedtuple('font_key', ['path', 'size', 'bold'])
+style = namedtuple('style', ['font', 'text_color', 'box_color',
+                             'background_color', 'border_width',
+                             'text_align', 'antialias'])
+
+# Caches of resolved font paths, shared fonts, glyph advances and interned
+# styles
+_font_paths = {}
+_fonts = {}
+_advances = {}
+_styles = {}
+
+# Strings measured with font.size by max_text_width, both of the widest
+# estimates and of an even sample
+confirm_count = 32
+
+def _freeze(value):
+    '''
+    Returns a hashable version of value, so pygame.Color objects can be used
+    as style colors.
+    '''
+
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return tuple(value)
+
+def resolve_font(font_family):
+    '''
+    Resolves a font family name to a font file path. Results are cached since
+    system font lookups are slow.
+
+    Args:
+        font_family (ttf): font family or path to a font file
+
+    Returns:
+        str: path to a font file, or None for pygame's default font
+    '''
+
+    if font_family not in _font_paths:
+        if font_family is not None and os.path.isfile(font_family):
+            _font_paths[font_family] = font_family
+        else:
+            _font_paths[font_family] = pygame.font.match_font(font_family)
+    return _font_paths[font_family]
+
+def get_font_key(font_family, font_size, bold = False):
+    '''
+    Creates the key identifying a shared font.
+
+    Args:
+        font_family (ttf): font family or path to a font file
+        font_size (int): size of font
+        bold (bool): whether or not font is bold
+
+    Returns:
+        namedtuple('font_key', ['path', 'size', 'bold'])
+    '''
+
+    return font_key(path = resolve_font(font_family), size = font_size,
+                    bold = bool(bold))
+
+def get_font(key):
+    '''
+    Returns the shared pygame font for a font key. Shared fonts must not be
+    modified (e.g. with set_bold), use a different key instead.
+
+    Args:
+        key (namedtuple('font_key', ['path', 'size', 'bold'])): font key
+
+    Returns:
+        pygame.font.Font
+    '''
+
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.Font(key.path, key.size)
+        font.set_bold(key.bold)
+        _fonts[key] = font
+    return font
+
+def find_font_key(font):
+    '''
+    Finds the key of a shared font.
+
+    Args:
+        font (pygame.font.Font): font returned by get_font
+
+    Returns:
+        namedtuple('font_key', ['path', 'size', 'bold']), None if font is
+        not shared
+    '''
+
+    for key, shared_font in _fonts.items():
+        if shared_font is font:
+            return key
+    return None
+
+def get_font_paths():
+    '''
+    Returns the resolved font paths, keyed by font family.
+    '''
+
+    return dict(_font_paths)
+
+def add_font_paths(font_paths):
+    '''
+    Adds previously resolved font paths, so those font families are not
+    looked up again.
+
+    Args:
+        font_paths (dict): font file path, keyed by font family
+    '''
+
+    _font_paths.update(font_paths)
+
+def get_advances(key, characters):
+    '''
+    Returns the cached glyph advances of a font, making sure the given
+    characters are included. Missing glyphs are measured with a single
+    font.metrics call.
+
+    Args:
+        key (namedtuple('font_key', ['path', 'size', 'bold'])): font key
+        characters (iterable): characters that must be measured
+
+    Returns:
+        dict: advance in pixels for each measured character
+    '''
+
+    advances = _advances.setdefault(key, {})
+    missing = ''.join(set(characters).difference(advances))
+    if missing:
+        font = get_font(key)
+        for character, metrics in zip(missing, font.metrics(missing)):
+            if metrics is None:
+                metrics = (0, 0, 0, 0, font.size(character)[0])
+            advances[character] = metrics[4]
+    return advances
+
+def text_widths(key, texts):
+    '''
+    Measures the widths of many strings at once from cached glyph advances.
+    Kerning is ignored, so widths can be a few pixels off from font.size.
+
+    Args:
+        key (namedtuple('font_key', ['path', 'size', 'bold'])): font key
+        texts (list): strings to measure
+
+    Returns:
+        list: width in pixels of each string
+    '''
+
+    advances = get_advances(key, ''.join(texts))
+    return [sum(map(advances.__getitem__, text)) for text in texts]
+
+def max_text_width(key, texts):
+    '''
+    Finds the width of the widest string, possibly a few pixels more. Widths
+    are estimated with text_widths(), then the confirm_count widest estimates
+    and an even sample of the rest are measured with font.size. The largest
+    error seen in those, plus 2 pixels, is allowed for the strings that were
+    not measured. With confirm_count strings or fewer the width is exact.
+
+    Args:
+        key (namedtuple('font_key', ['path', 'size', 'bold'])): font key
+        texts (list): strings to measure
+
+    Returns:
+        int: width in pixels of the widest string, 0 if there are none
+    '''
+
+    if not texts:
+        return 0
+
+    font = get_font(key)
+    estimates = text_widths(key, texts)
+    widest_estimates = heapq.nlargest(confirm_count, range(len(texts)),
+                                      key = estimates.__getitem__)
+    sample = range(0, len(texts), max(len(texts) // confirm_count, 1))
+
+    widest = 0
+    error = 0
+    measured = set(widest_estimates).union(sample)
+    for index in measured:
+        width = font.size(texts[index])[0]
+        widest = max(widest, width)
+        error = max(error, width - estimates[index])
+
+    # Strings not measured are estimated no wider than the last confirmed one
+    if len(measured) < len(texts):
+        widest = max(widest, estimates[widest_estimates[-1]] + error + 2)
+    return widest
+
+def get_style(font,
+              text_color = (0, 0, 0),
+              box_color = (0, 0, 0),
+              background_color = (127, 127, 127),
+              border_width = 2,
+              text_align = 'left',
+              antialias = True):
+    '''
+    Returns the shared style with the given attributes. Equal styles are
+    always the same object.
+
+    Args:
+        font (namedtuple('font_key', ['path', 'size', 'bold'])): font key
+        text_color (namedtuple('color', ['r', 'g', 'b'])): color of text
+        box_color (namedtuple('color', ['r', 'g', 'b'])): color of border
+        background_color (namedtuple('color', ['r', 'g', 'b'])): color of
+                                                                 background
+        border_width (int): pixels wide for border
+        text_align (str): 'left' or 'center'
+        antialias (bool): whether or not text is antialiased
+
+    Returns:
+        namedtuple('style', [...])
+    '''
+
+    key = style(font = font,
+                text_color = _freeze(text_color),
+                box_color = _freeze(box_color),
+                background_color = _freeze(background_color),
+                border_width = border_width,
+                text_align = text_align,
+                antialias = antialias)
+    return _styles.setdefault(key, key)
+
+def replace_style(current, **changes):
+    '''
+    Returns the shared style equal to current with some attributes changed.
+
+    Args:
+        current (namedtuple('style', [...])): style to start from
+        changes: style attributes to change
+
+    Returns:
+        namedtuple('style', [...])
+    '''
+
+    return get_style(**current._replace(**changes)._asdict())
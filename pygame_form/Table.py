@@ -7,18 +7,52 @@ Table class for forms in Pygame
 '''
 
 import pygame
-import os.path
+import time
 
 from .Constants import point, color
 from .Textbox import Textbox
+from .Style import get_font_key, get_font, max_text_width
 
 pygame.font.init()
 
+# Only two row colors exist, they are shared between all cells
+row_colors = (color(r = 127, g = 127, b = 200), color(r = 63, g = 63, b = 200))
+
+# Rows of a column measured at a time while building incrementally
+measure_chunk_size = 1000
+
 class Table(object):
     '''
     Table class for forms in Pygame. Values can be retrieved using cells array
+
+    Cells share their style and font objects (see Style.py), only one style
+    exists per row hue and header, so each cell holds just its own geometry,
+    value and rendered text.
+
+    Setting visible_row_count shows only that many rows (a header row stays
+    in place), the rest can be reached with scroll(). Text of a cell is
+    rendered when it is first shown, prefetch() can be called during idle
+    frames to render the pages around the visible rows ahead of time.
+
+    With incremental set, create() only prepares the Table and cells are
+    built by calling build() once per frame with a time budget. Cells that
+    are not built yet are shown as placeholders in background_color.
+
+    Cell values are taken from values, a list of rows. Column widths are 10
+    characters unless given in pixels with column_widths, or measured from
+    values when column_widths is 'auto'. In incremental mode the columns are
+    measured by build() before any cell is built.
     '''
 
+    __slots__ = ('position', 'row_count', 'column_count', 'has_header',
+                 'text_align', 'text_color', 'box_color', 'background_color',
+                 'border_width', 'font_family', 'font_size', 'antialias',
+                 'visible_row_count', 'first_row', 'incremental',
+                 'on_progress', 'on_complete', 'values', 'column_widths',
+                 'min_column_width', 'max_column_width', 'sample_size',
+                 'cell_dimension', 'cell_widths', 'column_x', 'pending_rows',
+                 'measured_widths', 'measured_row', 'cells')
+
     def __init__(self,
                  position = point(x = 0, y = 0),
                  row_count = 3,
@@ -31,7 +65,16 @@ class Table(object):
                  text_color = color(r = 0, g = 0, b = 0),
                  box_color = color(r = 0, g = 0, b = 0),
                  background_color = color(r = 127, g = 127, b = 127),
-                 border_width = 2):
+                 border_width = 2,
+                 visible_row_count = None,
+                 incremental = False,
+                 on_progress = None,
+                 on_complete = None,
+                 values = None,
+                 column_widths = None,
+                 min_column_width = 0,
+                 max_column_width = None,
+                 sample_size = None):
         '''
         init for Table class.
         
@@ -49,8 +92,24 @@ class Table(object):
                                                                 border
             background_color (namedtuple('color', ['r', 'g', 'b'])): color of
                                                                      Cell
-                                                                     background
+                                                                     placeholders
             border_width (int): pixels wide for border of textbox
+            visible_row_count (int): number of rows shown at a time, None
+                                     shows all rows
+            incremental (bool): whether cells are built over several frames
+                                with build()
+            on_progress (function): called with built and total cell counts
+                                    after each build() slice
+            on_complete (function): called once all cells are built
+            values (list): rows of cell values, header row first
+            column_widths (list): pixel width of each column, 'auto' to
+                                  measure them from values, without values
+                                  columns are 10 characters wide
+            min_column_width (int): smallest measured column width
+            max_column_width (int): largest measured column width, None for
+                                    no limit
+            sample_size (int): number of rows measured for 'auto' widths,
+                               None measures every row
         '''
 
         # Screen variables
@@ -65,6 +124,16 @@ class Table(object):
         self.box_color = box_color
         self.background_color = background_color
         self.border_width = border_width
+        self.visible_row_count = visible_row_count
+        self.first_row = 1 if has_header else 0
+        self.incremental = incremental
+        self.on_progress = on_progress
+        self.on_complete = on_complete
+        self.values = values
+        self.column_widths = column_widths
+        self.min_column_width = min_column_width
+        self.max_column_width = max_column_width
+        self.sample_size = sample_size
 
         # Text variables
         self.font_family = font_family
@@ -77,43 +146,391 @@ class Table(object):
 
     def create(self):
         '''
-        Creates Table and Cell objects.
+        Creates Table and Cell objects. In incremental mode cells are left to
+        build().
         '''
 
         self.cells = []
 
-        hue_1 = 127
-        hue_2 = 63
-        hue = hue_1
-        blue = 200
-        x = self.position.x
-        y = self.position.y
+        # Cell size, measured once for all cells
+        text_width, text_height = get_font(get_font_key(self.font_family,
+                                                        self.font_size)).size('M')
+        self.cell_dimension = point(x = text_width * 10, y = text_height)
 
-        if self.has_header:
-            bold = True
+        # Column sizes
+        self.pending_rows = None
+        default_widths = [self.cell_dimension.x] * self.column_count
+        if self.column_widths == 'auto' and self.values is not None:
+            if self.incremental:
+                # Measured by build(), placeholders use the default width
+                self.set_column_widths(default_widths)
+                self.start_measuring()
+            else:
+                self.set_column_widths(self.measure_columns())
+        elif self.column_widths is not None and self.column_widths != 'auto':
+            if len(self.column_widths) != self.column_count:
+                raise ValueError('column_widths has %d widths for %d columns' %
+                                 (len(self.column_widths), self.column_count))
+            self.set_column_widths(self.column_widths)
         else:
-            bold = False
-            
-        for row in range(self.row_count):
-            for column in range(self.column_count):
-                cell = Textbox(position = point(x = x, y = y),
-                               character_count = 10,
-                               font_family = self.font_family,
-                               font_size = self.font_size,
-                               antialias = self.antialias,
-                               text_color = self.text_color,
-                               box_color = color(r = hue, g = hue, b = blue),
-                               background_color = color(r = hue, g = hue, b = blue),
-                               border_width = 0)
-                cell.bold = bold
-                cell.text_align = self.text_align
+            self.set_column_widths(default_widths)
+
+        if not self.incremental:
+            while len(self.cells) < self.row_count * self.column_count:
+                self.cells.append(self.create_cell(len(self.cells)))
+            self.place_rows()
+
+    def set_column_widths(self, widths):
+        '''
+        Sets the pixel width of each column and where each column starts.
+
+        Args:
+            widths (list): pixel width of each column
+        '''
+
+        self.cell_widths = list(widths)
+        self.column_x = []
+        x = self.position.x
+        for width in self.cell_widths:
+            self.column_x.append(x)
+            x = x + width + 2
+
+    def create_cell(self, index):
+        '''
+        Creates a single Cell.
+
+        Args:
+            index (int): index of cell in cells array
+
+        Returns:
+            Textbox: the cell
+        '''
+
+        row, column = divmod(index, self.column_count)
+        hue = row_colors[row % 2]
+        cell = Textbox(position = point(x = self.column_x[column],
+                                        y = self.position.y + row * (self.cell_dimension.y + 2)),
+                       character_count = 10,
+                       font_family = self.font_family,
+                       font_size = self.font_size,
+                       antialias = self.antialias,
+                       text_color = self.text_color,
+                       box_color = hue,
+                       background_color = hue,
+                       border_width = 0)
+        cell.bold = self.has_header and row == 0
+        cell.text_align = self.text_align
+        if self.cell_widths[column] != cell.box_dimension.x:
+            cell.resize(self.cell_widths[column])
+        cell.change_value(self.cell_value(row, column), render = False)
+        return cell
+
+    def cell_value(self, row, column):
+        '''
+        Value of a cell taken from values.
+
+        Args:
+            row (int): row index
+            column (int): column index
+
+        Returns:
+            str: value of the cell
+        '''
+
+        if self.values is None:
+            return 'test text'
+        if row < len(self.values) and column < len(self.values[row]):
+            return str(self.values[row][column])
+        return ''
+
+    def measured_rows(self):
+        '''
+        Rows of values measured for 'auto' widths, not counting the header.
+        With sample_size set, only that many evenly spread rows are measured.
+
+        Returns:
+            list: rows of values
+        '''
+
+        header_count = 1 if self.has_header else 0
+        rows = self.values[header_count:self.row_count]
+        if self.sample_size is not None and len(rows) > self.sample_size:
+            step = len(rows) / self.sample_size
+            rows = [rows[int(i * step)] for i in range(self.sample_size)]
+        return rows
+
+    def measure_rows(self, column, rows):
+        '''
+        Measures the widest value of a column in some rows, using cached
+        glyph advances.
+
+        Args:
+            column (int): column index
+            rows (list): rows of values
+
+        Returns:
+            int: pixel width of the widest value
+        '''
+
+        return max_text_width(get_font_key(self.font_family, self.font_size),
+                              [str(row[column]) if column < len(row) else ''
+                               for row in rows])
+
+    def measure_header(self, column):
+        '''
+        Measures the header value of a column in bold.
+
+        Args:
+            column (int): column index
+
+        Returns:
+            int: pixel width of the header value, 0 without a header
+        '''
+
+        if not self.has_header:
+            return 0
+        return max_text_width(get_font_key(self.font_family, self.font_size,
+                                           bold = True),
+                              [self.cell_value(0, column)])
+
+    def limit_width(self, width):
+        '''
+        Keeps a measured width between min_column_width and max_column_width.
+
+        Args:
+            width (int): measured pixel width
+
+        Returns:
+            int: limited pixel width
+        '''
+
+        width = max(width, self.min_column_width)
+        if self.max_column_width is not None:
+            width = min(width, self.max_column_width)
+        return width
+
+    def measure_columns(self):
+        '''
+        Measures the width of each column from values in one pass per column.
+
+        Returns:
+            list: pixel width of each column
+        '''
+
+        rows = self.measured_rows()
+        return [self.limit_width(max(self.measure_rows(column, rows),
+                                     self.measure_header(column)))
+                for column in range(self.column_count)]
+
+    def start_measuring(self):
+        '''
+        Prepares measuring columns in slices with measure().
+        '''
+
+        if self.column_count == 0:
+            return
+        self.pending_rows = self.measured_rows()
+        self.measured_widths = [self.measure_header(0)]
+        self.measured_row = 0
+
+    def measure(self, end_time):
+        '''
+        Measures columns, measure_chunk_size rows at a time, until end_time.
+        Column widths are set once every column is measured.
+
+        Args:
+            end_time (float): time.perf_counter() value to stop at
+
+        Returns:
+            bool: True when all columns are measured
+        '''
+
+        while self.pending_rows is not None and time.perf_counter() < end_time:
+            column = len(self.measured_widths) - 1
+            rows = self.pending_rows[self.measured_row:
+                                     self.measured_row + measure_chunk_size]
+            self.measured_widths[column] = max(self.measured_widths[column],
+                                               self.measure_rows(column, rows))
+            self.measured_row = self.measured_row + len(rows)
+
+            if self.measured_row >= len(self.pending_rows):
+                self.measured_widths[column] = self.limit_width(self.measured_widths[column])
+                if column + 1 == self.column_count:
+                    self.set_column_widths(self.measured_widths)
+                    self.pending_rows = None
+                else:
+                    self.measured_widths.append(self.measure_header(column + 1))
+                    self.measured_row = 0
+
+        return self.pending_rows is None
+
+    def is_built(self):
+        '''
+        Decides whether or not all cells are built.
+
+        Returns:
+            True: all cells built
+            False: cells are missing, see build()
+        '''
+
+        return len(self.cells) == self.row_count * self.column_count
+
+    def build(self, time_budget = 0.005):
+        '''
+        Builds cells until time_budget runs out. Meant to be called once per
+        frame while the Table is incremental and not yet built. 'auto' column
+        widths are measured first, then cells are built and cells of visible
+        rows rendered.
+
+        Args:
+            time_budget (float): seconds to spend building
+
+        Returns:
+            bool: True when all cells are built
+        '''
+
+        if self.is_built():
+            return True
+
+        end_time = time.perf_counter() + time_budget
+        if self.measure(end_time):
+            while not self.is_built() and time.perf_counter() < end_time:
+                index = len(self.cells)
+                cell = self.create_cell(index)
+
+                # Only cells of a scrolled table can be out of place
+                slot = self.row_slot(index // self.column_count)
+                if slot is not None:
+                    y = self.position.y + slot * (self.cell_dimension.y + 2)
+                    if cell.position.y != y:
+                        cell.move(point(x = cell.position.x, y = y))
+                    cell.render()
                 self.cells.append(cell)
-                cell.change_value('test text')
-                x = x + (cell.text_width * cell.character_count) + 2
-            bold = False
-            hue = hue_2 if hue == hue_1 else hue_1
-            x = self.position.x
-            y = y + cell.text_height + 2
+
+        cell_count = self.row_count * self.column_count
+        if self.on_progress is not None:
+            self.on_progress(len(self.cells), cell_count)
+        if self.is_built() and self.on_complete is not None:
+            self.on_complete()
+
+        return self.is_built()
+
+    def page_size(self):
+        '''
+        Number of rows, not counting the header, shown at a time.
+
+        Returns:
+            int: rows per page
+        '''
+
+        header_count = 1 if self.has_header else 0
+        if self.visible_row_count is None:
+            return self.row_count - header_count
+        return max(self.visible_row_count - header_count, 0)
+
+    def visible_rows(self):
+        '''
+        Rows currently shown, header row first.
+
+        Returns:
+            list: row indexes
+        '''
+
+        rows = [0] if self.has_header else []
+        last_row = min(self.first_row + self.page_size(), self.row_count)
+        return rows + list(range(self.first_row, last_row))
+
+    def row_slot(self, row):
+        '''
+        Where a row is shown, counted from the top of the table.
+
+        Args:
+            row (int): row index
+
+        Returns:
+            int: position of the row among the visible rows, None if hidden
+        '''
+
+        if self.has_header and row == 0:
+            return 0
+        if self.first_row <= row < self.first_row + self.page_size():
+            header_count = 1 if self.has_header else 0
+            return header_count + row - self.first_row
+        return None
+
+    def row_cells(self, row):
+        '''
+        Cells of a row.
+
+        Args:
+            row (int): row index
+
+        Returns:
+            list: Textbox cells of the row
+        '''
+
+        start = row * self.column_count
+        return self.cells[start:start + self.column_count]
+
+    def place_rows(self):
+        '''
+        Moves the visible rows into place below the table position.
+        '''
+
+        y = self.position.y
+        for row in self.visible_rows():
+            for cell in self.row_cells(row):
+                if cell.position.y != y:
+                    cell.move(point(x = cell.position.x, y = y))
+            y = y + self.cell_dimension.y + 2
+
+    def scroll(self, rows):
+        '''
+        Scrolls the table by a number of rows.
+
+        Args:
+            rows (int): rows to scroll, negative scrolls up
+        '''
+
+        header_count = 1 if self.has_header else 0
+        last_first_row = max(self.row_count - self.page_size(), header_count)
+        self.first_row = min(max(self.first_row + rows, header_count),
+                             last_first_row)
+        self.place_rows()
+
+    def prefetch(self, time_budget = 0.002, pages = 1):
+        '''
+        Renders text of the pages before and after the visible rows, so they
+        are ready when scrolled to. Meant to be called once per frame with
+        the time left in the frame. Rendering happens on the calling thread
+        since pygame fonts can not be used from several threads.
+
+        Args:
+            time_budget (float): seconds to spend rendering
+            pages (int): pages to prefetch in each direction
+
+        Returns:
+            bool: True when all prefetched pages are rendered
+        '''
+
+        page_size = self.page_size()
+        header_count = 1 if self.has_header else 0
+        next_rows = range(self.first_row + page_size,
+                          min(self.first_row + page_size * (pages + 1),
+                              self.row_count))
+        previous_rows = range(self.first_row - 1,
+                              max(self.first_row - page_size * pages,
+                                  header_count) - 1, -1)
+
+        end_time = time.perf_counter() + time_budget
+        for rows in (next_rows, previous_rows):
+            for row in rows:
+                for cell in self.row_cells(row):
+                    if cell.value_object is None:
+                        if time.perf_counter() >= end_time:
+                            return False
+                        cell.render()
+        return True
 
     def center(self, surface_resolution):
         '''
@@ -123,9 +540,7 @@ class Table(object):
             surface_resolion (point): width and height of surface to center to.
         '''
         
-        cell_width = self.cells[0].text_width
-        table_width = ((cell_width * self.cells[0].character_count) * self.column_count) + \
-                      2 * (self.column_count - 1)
+        table_width = sum(self.cell_widths) + 2 * (self.column_count - 1)
         table_x = int((surface_resolution.width / 2) - (table_width / 2))
 
         self.position = point(x = table_x, y = self.position.y)
@@ -140,8 +555,19 @@ class Table(object):
             surface (pygame.surface): Surface to show table on.
         '''
         
-        for cell in self.cells:
-            cell.show(surface)
+        y = self.position.y
+        for row in self.visible_rows():
+            cells = self.row_cells(row)
+            for cell in cells:
+                cell.show(surface)
+
+            # Placeholders for cells not built yet
+            for column in range(len(cells), self.column_count):
+                pygame.draw.rect(surface, self.background_color,
+                                 pygame.Rect(self.column_x[column], y,
+                                             self.cell_widths[column],
+                                             self.cell_dimension.y))
+            y = y + self.cell_dimension.y + 2
 
 
         
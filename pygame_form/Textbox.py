@@ -7,9 +7,9 @@ Textbox class for forms in Pygame
 '''
 
 import pygame
-import os.path
 
 from .Constants import point, color
+from .Style import get_font_key, get_font, get_style, replace_style
 
 pygame.font.init()
 
@@ -28,8 +28,16 @@ class Textbox(object):
     '''
     Textbox class for forms in Pygame. The value of the textbox can be
     retrieved using object.value.
+
+    Colors, border, alignment and font are kept in a shared style object
+    (see Style.py), so Textboxes that look the same share their style and
+    font instead of each holding copies.
     '''
 
+    __slots__ = ('position', 'character_count', 'style', 'font', 'value',
+                 'value_object', 'text_width', 'text_height', 'box_dimension',
+                 'box', 'text_position')
+
     def __init__(self,
                  position = point(x = 0, y = 0),
                  character_count = 50,
@@ -64,28 +72,97 @@ class Textbox(object):
 
         # Text variables
         self.character_count = character_count
-        if not os.path.isfile(font_family):
-            font_family = pygame.font.match_font(font_family)
-        self.font = pygame.font.Font(font_family, font_size)
-        self.font_size = font_size
-        self.antialias = antialias
         self.value_object = None
         self.value = ''
 
         # Textbox variables
-        self.text_color = text_color
-        self.box_color = box_color
-        self.background_color = background_color
-        self.border_width = border_width
-        self.text_align = 'left'
-        self.bold = False
+        self.style = get_style(font = get_font_key(font_family, font_size),
+                               text_color = text_color,
+                               box_color = box_color,
+                               background_color = background_color,
+                               border_width = border_width,
+                               text_align = 'left',
+                               antialias = antialias)
+        self.font = get_font(self.style.font)
 
         # Create Textbox objects
         self.create()
 
+    def _set_style(self, **changes):
+        '''
+        Switches Textbox to the shared style with the given changes.
+        '''
+
+        self.style = replace_style(self.style, **changes)
+        self.font = get_font(self.style.font)
+
+    @property
+    def font_size(self):
+        return self.style.font.size
+
+    @font_size.setter
+    def font_size(self, value):
+        self._set_style(font = self.style.font._replace(size = value))
+
+    @property
+    def bold(self):
+        return self.style.font.bold
+
+    @bold.setter
+    def bold(self, value):
+        self._set_style(font = self.style.font._replace(bold = bool(value)))
+
+    @property
+    def antialias(self):
+        return self.style.antialias
+
+    @antialias.setter
+    def antialias(self, value):
+        self._set_style(antialias = value)
+
+    @property
+    def text_color(self):
+        return self.style.text_color
+
+    @text_color.setter
+    def text_color(self, value):
+        self._set_style(text_color = value)
+
+    @property
+    def box_color(self):
+        return self.style.box_color
+
+    @box_color.setter
+    def box_color(self, value):
+        self._set_style(box_color = value)
+
+    @property
+    def background_color(self):
+        return self.style.background_color
+
+    @background_color.setter
+    def background_color(self, value):
+        self._set_style(background_color = value)
+
+    @property
+    def border_width(self):
+        return self.style.border_width
+
+    @border_width.setter
+    def border_width(self, value):
+        self._set_style(border_width = value)
+
+    @property
+    def text_align(self):
+        return self.style.text_align
+
+    @text_align.setter
+    def text_align(self, value):
+        self._set_style(text_align = value)
+
     def create(self):
         '''
-        Creates Textbox and text objects.
+        Creates Textbox objects.
         '''
 
         # Textbox
@@ -96,18 +173,16 @@ class Textbox(object):
 
         # Decorate text
         self.align()
-        self.set_bold()
 
-        # Set texxt object
-        self.value_object = self.font.render(self.value, self.antialias,
-                                             self.text_color)
+        # Text object is rendered by render() or show()
+        self.value_object = None
         
     def set_bold(self):
         '''
         Sets whether Cell text is bold or not.
         '''
 
-        self.font.set_bold(self.bold)
+        self.font = get_font(self.style.font)
         self.align()
 
         # Set texxt object
@@ -127,31 +202,76 @@ class Textbox(object):
         text_y = int((self.box_dimension.y - text_height) / 2) + self.position.y
         self.text_position = point(x = text_x, y = text_y)
 
-    def change_value(self, value):
+    def change_value(self, value, render = True):
         '''
         Changes value of textbox.
 
         Args:
             value (str): string value of the textbox
+            render (bool): whether to render the text now, or leave it to
+                           render() or show()
         '''
 
         self.value = value
 
-        # Make text fit box
-        x, y = self.font.size(self.value)
-        overall_width = x
-        while overall_width > self.box_dimension.x - (self.border_width * 2):
-            self.value = self.value[:len(self.value) - 1]
-            x, y = self.font.size(self.value)
-            overall_width = x
+        # Make text fit box, searching for the longest fitting start of value
+        box_width = self.box_dimension.x - (self.border_width * 2)
+        if self.font.size(self.value)[0] > box_width:
+            low = 0
+            high = len(self.value) - 1
+            while low < high:
+                middle = (low + high + 1) // 2
+                if self.font.size(self.value[:middle])[0] > box_width:
+                    high = middle - 1
+                else:
+                    low = middle
+            self.value = self.value[:low]
 
         # Decorate text
         self.align()
-        self.set_bold()
 
         # Set text object
-        self.value_object = self.font.render(self.value, self.antialias,
-                                             self.text_color) 
+        self.value_object = None
+        if render:
+            self.render()
+
+    def render(self):
+        '''
+        Renders text object if it has not been rendered since the value last
+        changed.
+        '''
+
+        if self.value_object is None:
+            self.value_object = self.font.render(self.value, self.antialias,
+                                                 self.text_color)
+
+    def resize(self, width):
+        '''
+        Sets the width of Textbox in pixels instead of characters. Changing
+        the value afterwards keeps it fitting the new width.
+
+        Args:
+            width (int): new width of textbox in pixels
+        '''
+
+        self.box_dimension = point(x = width, y = self.box_dimension.y)
+        self.box = pygame.Rect(self.position, self.box_dimension)
+        self.align()
+
+    def move(self, position):
+        '''
+        Moves Textbox to a new position without measuring or rendering text.
+
+        Args:
+            position (namedtuple('point', ['x', 'y'])): new position of textbox
+        '''
+
+        x_offset = position.x - self.position.x
+        y_offset = position.y - self.position.y
+        self.position = position
+        self.box = pygame.Rect(self.position, self.box_dimension)
+        self.text_position = point(x = self.text_position.x + x_offset,
+                                   y = self.text_position.y + y_offset)
 
     def show(self, surface):
         '''
@@ -168,6 +288,7 @@ class Textbox(object):
                          self.box, self.border_width)
 
         # Display text
+        self.render()
         surface.blit(self.value_object, self.text_position)        
 
 class InputBox(Textbox):
@@ -176,6 +297,11 @@ class InputBox(Textbox):
     Setting is_password to True makes it a password input, where text is
     masked. The value of the textbox can be retrieved using object.value.
     '''
+
+    __slots__ = ('is_password', 'password', 'tab_index', 'active',
+                 'cursor_visible', 'blink_seconds', 'frame_count',
+                 'cursor_index', 'cursor_position', 'cursor_dimension',
+                 'cursor')
     
     def __init__(self,
                  position = point(x = 0, y = 0),
@@ -210,7 +336,7 @@ class InputBox(Textbox):
         '''
         
         Textbox.__init__(self, position, character_count, font_family, font_size,
-                         antialias, text_color, box_color, backgroun_color,
+                         antialias, text_color, box_color, background_color,
                          border_width)
 
         self.is_password = is_password
@@ -244,6 +370,21 @@ class InputBox(Textbox):
                                       y = self.text_height)
         self.cursor = pygame.Rect(self.cursor_position, self.cursor_dimension)
 
+    def move(self, position):
+        '''
+        Moves InputBox and its cursor to a new position.
+
+        Args:
+            position (namedtuple('point', ['x', 'y'])): new position of InputBox
+        '''
+
+        x_offset = position.x - self.position.x
+        y_offset = position.y - self.position.y
+        Textbox.move(self, position)
+        self.cursor_position = point(x = self.cursor_position.x + x_offset,
+                                     y = self.cursor_position.y + y_offset)
+        self.cursor = pygame.Rect(self.cursor_position, self.cursor_dimension)
+
     def clicked(self):
         '''
         Decides whether or not textbox was clicked.
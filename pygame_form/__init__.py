@@ -2,3 +2,5 @@ from .Textbox import Textbox, textbox_event, InputBox
 from .Label   import Label
 from .Button  import Button
 from .Table   import Table
+from .Form    import Form
+from .Render  import render, render_array, run_golden_tests
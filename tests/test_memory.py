@@ -0,0 +1,36 @@
+'''
+Tests for the per-cell memory footprint documented in README.md
+'''
+
+import gc
+import tracemalloc
+
+from pygame_form import Table
+
+# Documented limits, bytes of Python heap per Table cell
+unrendered_cell_limit = 450
+rendered_cell_limit = 520
+
+
+def test_cell_footprint():
+    # Warm the font and style caches
+    Table(row_count = 2, column_count = 3)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        table = Table(row_count = 1000, column_count = 3)
+        gc.collect()
+        unrendered = tracemalloc.get_traced_memory()[0] - before
+
+        for cell in table.cells:
+            cell.render()
+        gc.collect()
+        rendered = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    cell_count = len(table.cells)
+    assert unrendered / cell_count <= unrendered_cell_limit
+    assert rendered / cell_count <= rendered_cell_limit
@@ -0,0 +1,36 @@
+'''
+Tests for Table class
+'''
+
+import random
+import string
+
+from pygame_form import Table
+
+
+def auto_table(values):
+    return Table(row_count = len(values),
+                 column_count = 1,
+                 values = [[value] for value in values],
+                 column_widths = 'auto')
+
+
+def test_auto_width_keeps_numbers():
+    values = [str(i * 1234567) for i in range(20000)]
+    table = auto_table(values)
+    assert [cell.value for cell in table.cells] == values
+
+
+def test_auto_width_keeps_similar_values():
+    values = ['Customer %05d' % i for i in range(20000)]
+    table = auto_table(values)
+    assert [cell.value for cell in table.cells] == values
+
+
+def test_auto_width_keeps_mixed_text():
+    generator = random.Random(0)
+    values = [''.join(generator.choice(string.printable[:95])
+                      for _ in range(generator.randint(1, 40)))
+              for _ in range(20000)]
+    table = auto_table(values)
+    assert [cell.value for cell in table.cells] == values